@@ -1,71 +1,242 @@
 from selenium import webdriver
 from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import (TimeoutException, 
-                                      StaleElementReferenceException, 
-                                      NoSuchElementException,
-                                      WebDriverException)
-from bs4 import BeautifulSoup
-import time
+from selenium.common.exceptions import TimeoutException
+import lxml.html
+from lxml.cssselect import CSSSelector
+import aiohttp
+import asyncio
+import diskcache
 import csv
+import gzip
+import io
+import json
+import os
 import re
-import random
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from html import unescape
+from operator import itemgetter
 
 # Configuration
-MAX_WORKERS = 3  # Conservative to avoid blocking
+MAX_CONCURRENT_MOVIES = 32  # Movies scraped at once; keep modest to avoid rate limiting
+CONNECTION_LIMIT = 64
 INITIAL_URL = "https://www.imdb.com/search/title/?release_date=1995-01-01,&user_rating=6,10&num_votes=50000,"
+# Output is normalized: one row per movie, reviews reference it by tconst
+MOVIE_FIELDS = ('tconst', 'title', 'year', 'genres', 'imdb_rating', 'director', 'cast')
+REVIEW_FIELDS = ('tconst', 'user_rating', 'helpful', 'review_text')
+MOVIES_FILE = 'movies.csv.gz'
+REVIEWS_FILE = 'reviews.csv.gz'
+FLUSH_EVERY = 10  # Completed movies per gzip member written to disk
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scrape_cache')
+CACHE_EXPIRE = 7 * 86400  # Seconds before a cached movie is scraped again
+CACHE_SIZE_LIMIT = 10 << 30
+LOAD_RETRIES = 3  # Consecutive empty "See more" attempts before the listing is done
+GRAPHQL_URL = "https://caching.graphql.imdb.com/"
+GRAPHQL_PAGE_SIZE = 250
+UBLOCK_XPI = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'addons', 'uBlock0.xpi')
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
+_YEAR_RE = re.compile(r'\d{4}')
+_NEWLINE_RE = re.compile(r'\s*\n\s*')
+_TCONST_RE = re.compile(r'tt\d+')
+_movie_row = itemgetter(*MOVIE_FIELDS)
+_review_row = itemgetter(*REVIEW_FIELDS)
+
+# Compiled once and reused for every page
+_SEL_JSON_LD = CSSSelector('script[type="application/ld+json"]')
+_SEL_TITLE = CSSSelector("h1[data-testid='hero__pageTitle']")
+_SEL_RELEASE = CSSSelector("a[href*='releaseinfo']")
+_SEL_GENRES = CSSSelector("a.ipc-chip span.ipc-chip__text")
+_SEL_RATING = CSSSelector("div[data-testid='hero-rating-bar__aggregate-rating__score'] span")
+_SEL_CREDIT_LABELS = CSSSelector("li span")
+_SEL_NAME_LINKS = CSSSelector("a[href*='/name/']")
+_SEL_CAST = CSSSelector("a[data-testid*='title-cast-item__actor']")
+_SEL_REVIEWS = CSSSelector("article.user-review-item")
+_SEL_NEXT_DATA = CSSSelector('script#__NEXT_DATA__')
+_SEL_REVIEW_TEXT = CSSSelector("div.ipc-html-content-inner-div")
+_SEL_USER_RATING = CSSSelector("span.ipc-rating-star--rating")
+_SEL_UPVOTES = CSSSelector("span.ipc-voting__label__count--up")
+_SEL_DOWNVOTES = CSSSelector("span.ipc-voting__label__count--down")
+_SEL_MOVIE_LINKS = CSSSelector('a.ipc-title-link-wrapper[href*="/title/tt"]')
+
+# Same filters as INITIAL_URL, paged with the connection cursor
+ADVANCED_SEARCH_QUERY = """
+query AdvancedTitleSearch($first: Int!, $after: String) {
+  advancedTitleSearch(
+    first: $first
+    after: $after
+    constraints: {
+      releaseDateConstraint: {releaseDateRange: {start: "1995-01-01"}}
+      userRatingsConstraint: {
+        aggregateRatingRange: {min: 6, max: 10}
+        ratingsCountRange: {min: 50000}
+      }
+    }
+  ) {
+    pageInfo { hasNextPage endCursor }
+    edges { node { title { id } } }
+  }
+}
+"""
+
+REQUEST_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip",
+}
+
 def init_driver(headless=True):
     options = Options()
     if headless:
         options.add_argument("--headless")
     options.set_preference("permissions.default.image", 2)
+    options.set_preference("permissions.default.stylesheet", 2)
+    options.set_preference("dom.webnotifications.enabled", False)
+    options.set_preference("media.autoplay.default", 5)
+    options.set_preference("browser.cache.disk.enable", False)  # Memory cache only
+    options.set_preference("network.http.max-persistent-connections-per-server", 8)
     options.set_preference("general.useragent.override", USER_AGENT)
     driver = webdriver.Firefox(options=options)
+    # Block third-party trackers and ads before the listing is loaded
+    if os.path.exists(UBLOCK_XPI):
+        driver.install_addon(UBLOCK_XPI, temporary=True)
     driver.set_page_load_timeout(45)
     return driver
 
-def safe_get_element(parent, by, selector, default="N/A"):
+def create_session():
+    """Shared keep-alive pool for the static title/review pages"""
+    connector = aiohttp.TCPConnector(limit=CONNECTION_LIMIT, ttl_dns_cache=300, keepalive_timeout=75)
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=REQUEST_HEADERS,
+        timeout=aiohttp.ClientTimeout(total=15)
+    )
+
+async def fetch_tree(session, url):
+    """Fetch a server-rendered page and parse it into an lxml tree"""
+    async with session.get(url) as response:
+        response.raise_for_status()
+        return lxml.html.fromstring(await response.text())
+
+def safe_get_element(parent, selector, default="N/A"):
     try:
-        element = parent.find_element(by, selector)
-        return element.text.strip()
-    except:
+        return selector(parent)[0].text_content().strip()
+    except IndexError:
         return default
 
+# Count matches in the page instead of transferring every element
+COUNT_ELEMENTS_JS = "return document.querySelectorAll(arguments[0]).length"
+
+# Locate, scroll to and click the last "See more" button in one WebDriver call
+CLICK_SEE_MORE_JS = """
+const buttons = document.querySelectorAll('button.ipc-see-more__button');
+if (!buttons.length) return false;
+const button = buttons[buttons.length - 1];
+button.scrollIntoView({behavior: 'smooth'});
+button.click();
+return true;
+"""
+
+async def fetch_movie_links(session):
+    """Get all matching title links from the advanced search GraphQL API"""
+    links = []
+    variables = {"first": GRAPHQL_PAGE_SIZE, "after": None}
+    
+    while True:
+        payload = {"operationName": "AdvancedTitleSearch", "query": ADVANCED_SEARCH_QUERY, "variables": variables}
+        async with session.post(GRAPHQL_URL, json=payload) as response:
+            response.raise_for_status()
+            search = (await response.json())['data']['advancedTitleSearch']
+        
+        links.extend(f"https://www.imdb.com/title/{edge['node']['title']['id']}/" for edge in search['edges'])
+        if not search['pageInfo']['hasNextPage']:
+            return links
+        variables["after"] = search['pageInfo']['endCursor']
+
+def wait_for_count_increase(driver, selector, prev, timeout=6):
+    """Wait until more than prev elements match selector; False on timeout"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+            lambda d: d.execute_script(COUNT_ELEMENTS_JS, selector) > prev
+        )
+        return True
+    except TimeoutException:
+        return False
+
 def load_all_movies(driver):
-    last_count = 0
+    selector = "a.ipc-title-link-wrapper"
     retries = 0
     
-    while retries < 5:
-        current_count = len(driver.find_elements(By.CSS_SELECTOR, "a.ipc-title-link-wrapper"))
-        if current_count > last_count:
-            last_count = current_count
-            retries = 0
-        else:
-            retries += 1
-
+    # Stop after LOAD_RETRIES consecutive attempts with no button, no new titles or an error
+    while retries < LOAD_RETRIES:
         try:
+            current_count = driver.execute_script(COUNT_ELEMENTS_JS, selector)
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-            time.sleep(2 + random.random())
             
-            buttons = driver.find_elements(By.CSS_SELECTOR, "button.ipc-see-more__button")
-            if buttons:
-                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth'});", buttons[-1])
-                driver.execute_script("arguments[0].click();", buttons[-1])
-                time.sleep(2 + random.random())
+            if not driver.execute_script(CLICK_SEE_MORE_JS):
+                # The button can briefly vanish while the list re-renders, so give it time to return
+                if not wait_for_count_increase(driver, "button.ipc-see-more__button", 0):
+                    retries += 1
+            elif wait_for_count_increase(driver, selector, current_count):
+                retries = 0
+            else:
+                retries += 1
 
         except Exception as e:
             print(f"Load error: {str(e)[:60]}")
             retries += 1
 
-def get_movie_metadata(driver):
-    """Extract metadata from main movie page with verified selectors"""
+def get_json_ld(tree):
+    """Structured data IMDB embeds in the title page; empty dict if missing"""
+    scripts = _SEL_JSON_LD(tree)
+    if not scripts:
+        return {}
+    try:
+        data = json.loads(scripts[0].text_content())
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def as_list(value):
+    """JSON-LD fields may hold a single value or a list of them"""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def person_names(value):
+    return [unescape(p['name']) for p in as_list(value) if isinstance(p, dict) and p.get('name')]
+
+def metadata_from_json_ld(data):
+    """Build metadata from JSON-LD (names in it are HTML-escaped)"""
+    directors = person_names(data.get('director'))
+    # name is the original-language title; the English display title is alternateName
+    title = data.get('alternateName')
+    return {
+        'title': unescape(title if isinstance(title, str) and title else data['name']),
+        'year': str(data.get('datePublished') or 'N/A')[:4],
+        'genres': as_list(data.get('genre')),
+        'imdb_rating': str((data.get('aggregateRating') or {}).get('ratingValue', 'N/A')),
+        'director': directors[0] if directors else 'N/A',
+        'cast': person_names(data.get('actor'))[:3]
+    }
+
+def get_movie_metadata(tree):
+    """Extract metadata from main movie page, preferring its JSON-LD block"""
+    data = get_json_ld(tree)
+    if data.get('name') and isinstance(data['name'], str):
+        try:
+            metadata = metadata_from_json_ld(data)
+        except Exception as e:
+            print(f"JSON-LD error: {str(e)[:80]}")
+        else:
+            # The hero heading is the display title the dataset has always used
+            hero_title = safe_get_element(tree, _SEL_TITLE)
+            if hero_title != 'N/A':
+                metadata['title'] = hero_title
+            return metadata
+    
+    # Fall back to the rendered HTML with verified selectors
     metadata = {
-        'title': safe_get_element(driver, By.CSS_SELECTOR, "h1[data-testid='hero__pageTitle']"),
+        'title': safe_get_element(tree, _SEL_TITLE),
         'year': 'N/A',
         'genres': [],
         'imdb_rating': 'N/A',
@@ -75,131 +246,159 @@ def get_movie_metadata(driver):
     
     try:
         # Release year
-        year_text = safe_get_element(driver, By.CSS_SELECTOR, "a[href*='releaseinfo']")
-        metadata['year'] = re.search(r'\d{4}', year_text).group(0) if year_text else 'N/A'
+        year_text = safe_get_element(tree, _SEL_RELEASE)
+        metadata['year'] = _YEAR_RE.search(year_text).group(0) if year_text else 'N/A'
         
         # Genres
-        genre_elements = driver.find_elements(By.CSS_SELECTOR, "a.ipc-chip span.ipc-chip__text")
-        metadata['genres'] = [g.text for g in genre_elements]
+        genre_elements = _SEL_GENRES(tree)
+        metadata['genres'] = [g.text_content().strip() for g in genre_elements]
 
         # Rating
-        rating_text = safe_get_element(driver, By.CSS_SELECTOR, "div[data-testid='hero-rating-bar__aggregate-rating__score'] span")
+        rating_text = safe_get_element(tree, _SEL_RATING)
         metadata['imdb_rating'] = rating_text.split('/')[0] if rating_text else 'N/A'
         
-        # Director
-        metadata['director'] = safe_get_element(driver, By.XPATH, "//li[.//span[text()='Director']]//a[contains(@href, '/name/')]")
+        # Director: first name link in the credit row labelled "Director"
+        director_labels = [span for span in _SEL_CREDIT_LABELS(tree) if span.text == 'Director']
+        if director_labels:
+            credit_row = next(director_labels[0].iterancestors('li'))
+            director_elements = _SEL_NAME_LINKS(credit_row)
+            metadata['director'] = director_elements[0].text_content().strip() if director_elements else 'N/A'
         
         # Cast (first 3)
-        cast_elements = driver.find_elements(By.XPATH, "//a[contains(@data-testid, 'title-cast-item__actor')]")
-        metadata['cast'] = [c.text for c in cast_elements[:3]]
+        cast_elements = _SEL_CAST(tree)
+        metadata['cast'] = [c.text_content().strip() for c in cast_elements[:3]]
 
     except Exception as e:
         print(f"Metadata error: {str(e)[:80]}")
 
     return metadata
 
-def scrape_reviews(main_url):
-    """Scrape reviews with verified 2024 IMDB structure"""
-    driver = init_driver()
+def element_text(element):
+    """Review text with one line per text node, as get_text('\n') did"""
+    return _NEWLINE_RE.sub('\n', '\n'.join(element.itertext())).strip()
+
+def iter_embedded_reviews(node):
+    """Review objects (dicts with a reviewText) anywhere in the Next.js page data"""
+    if isinstance(node, dict):
+        if isinstance(node.get('reviewText'), str):
+            yield node
+            return
+        for value in node.values():
+            yield from iter_embedded_reviews(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from iter_embedded_reviews(value)
+
+def embedded_review_texts(tree):
+    """Review bodies from the page's __NEXT_DATA__ in page order, spoilers included"""
+    scripts = _SEL_NEXT_DATA(tree)
+    if not scripts:
+        return []
+    try:
+        data = json.loads(scripts[0].text_content())
+    except ValueError:
+        return []
+    texts = []
+    for review in iter_embedded_reviews(data):
+        body = review['reviewText']
+        texts.append(element_text(lxml.html.fragment_fromstring(body, create_parent='div')) if body.strip() else '')
+    return texts
+
+async def scrape_reviews(session, main_url):
+    """Scrape a movie's metadata and reviews (verified 2024 IMDB structure); None on any failure"""
     reviews = []
+    skipped = 0
     
     try:
-        # Get main movie metadata
-        driver.get(main_url)
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, 'h1')))
-        metadata = get_movie_metadata(driver)
+        tconst = _TCONST_RE.search(main_url).group(0)
         
-        # Navigate to reviews page
+        # Title and reviews pages don't depend on each other, so fetch both at once.
+        # Reviews page is server-rendered, so the first batch is in the static HTML
         reviews_url = f"{main_url.rstrip('/')}/reviews/"
-        driver.get(reviews_url)
-        
-        # Handle "All Reviews" expansion
+        fetches = [
+            asyncio.ensure_future(fetch_tree(session, main_url)),
+            asyncio.ensure_future(fetch_tree(session, reviews_url))
+        ]
         try:
-            WebDriverWait(driver, 15).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[.//span[contains(., 'All Reviews')]]"))
-            ).click()
-            time.sleep(3)
-        except TimeoutException:
-            pass
+            main_tree, tree = await asyncio.gather(*fetches)
+        except BaseException:
+            # Don't leave the other request running outside the semaphore
+            for fetch in fetches:
+                fetch.cancel()
+            raise
         
-        # Scroll to load reviews
-        scroll_attempts = 0
-        last_review_count = 0
-        while scroll_attempts < 5:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-            time.sleep(2.5 + random.random())
-            
-            # Check for new reviews
-            containers = driver.find_elements(By.CSS_SELECTOR, "article.user-review-item")
-            if len(containers) == last_review_count:
-                scroll_attempts += 1
-            else:
-                scroll_attempts = 0
-                last_review_count = len(containers)
-            
-            if len(containers) >= 25:
-                break
+        # Get main movie metadata
+        metadata = get_movie_metadata(main_tree)
+        metadata['tconst'] = tconst
+
+        # Spoiler bodies are left out of the rendered HTML but kept in the page data.
+        # Only trust it when it lines up one-to-one with the review containers.
+        containers = _SEL_REVIEWS(tree)
+        embedded_texts = embedded_review_texts(tree)
+        if len(embedded_texts) != len(containers):
+            embedded_texts = None
 
-        # Process reviews
-        for container in containers:
+        # Process reviews; a malformed review is skipped on its own, not the whole movie
+        for i, container in enumerate(containers):
             try:
-                try:
-                    spoiler_btn = container.find_element(
-                        By.CSS_SELECTOR, 
-                        "button.review-spoiler-button[aria-label='Expand Spoiler']"
-                    )
-                    driver.execute_script("arguments[0].click();", spoiler_btn)
-                    time.sleep(0.5)  # Allow spoiler content to expand
-                except NoSuchElementException:
-                    pass
-
-                # Get cleaned review text
-                review_text = container.find_element(
-                    By.CSS_SELECTOR, "div.ipc-html-content-inner-div").get_attribute('innerHTML')
-                review_text = BeautifulSoup(review_text, 'html.parser').get_text('\n')
+                content = _SEL_REVIEW_TEXT(container)
+                if content:
+                    review_text = element_text(content[0])
+                elif embedded_texts and embedded_texts[i]:
+                    review_text = embedded_texts[i]
+                else:
+                    # Known gap: body neither rendered nor recoverable from the page data
+                    skipped += 1
+                    continue
+
                 review = {
-                    **metadata,
-                    'user_rating': safe_get_element(container, By.CSS_SELECTOR, "span.ipc-rating-star--rating", 'N/A').split()[0],
-                    'review_text': review_text.strip(),
+                    'tconst': tconst,
+                    'user_rating': (safe_get_element(container, _SEL_USER_RATING, 'N/A').split() or ['N/A'])[0],
+                    'review_text': review_text,
                     'helpful': parse_helpfulness(container)
                 }
                 reviews.append(review)
-            except StaleElementReferenceException:
-                continue
+            except Exception as e:
+                print(f"Review error ({main_url}): {str(e)[:80]}")
+                skipped += 1
 
     except Exception as e:
         print(f"Error scraping {main_url}: {str(e)[:80]}")
-    finally:
-        driver.quit()
+        return None
     
-    return reviews
+    return metadata, reviews, skipped
 
-def parse_helpfulness(container):
-    """Get thumbs up and total votes (up + down)"""
+def count_votes(container, selector):
+    """Vote count shown by selector, or 0 when the label isn't rendered"""
+    labels = selector(container)
+    if not labels:
+        return 0
     try:
-        up = convert_k(container.find_element(
-            By.CSS_SELECTOR, 
-            "span.ipc-voting__label__count--up"
-        ).text)
-        
-        down = convert_k(container.find_element(
-            By.CSS_SELECTOR,
-            "span.ipc-voting__label__count--down"
-        ).text)
-        
-        return f"{up}/{up + down}"
-    
-    except Exception as e:
+        return convert_k(labels[0].text_content())
+    except ValueError as e:
         print(f"Helpfulness error: {str(e)[:80]}")
-        return "0/0"
+        return 0
+
+def parse_helpfulness(container):
+    """Get thumbs up and total votes (up + down)"""
+    up = count_votes(container, _SEL_UPVOTES)
+    down = count_votes(container, _SEL_DOWNVOTES)
+    return f"{up}/{up + down}"
 
 
 def convert_k(value):
-    if 'K' in value:
-        return int(float(value.replace('K', '')) * 1000)
-    return int(value)
+    """Parse vote counts like '34', '1.2K' or '3M' without float rounding"""
+    s = value.strip()
+    if not s:
+        return 0
+    mul = 1000 if s[-1] in 'Kk' else (1_000_000 if s[-1] in 'Mm' else 1)
+    if mul == 1:
+        return int(s)
+    whole, _, frac = s[:-1].partition('.')
+    return int(whole) * mul + int((frac + '000')[:3]) * (mul // 1000)
 
-def main():
+def collect_movie_links():
+    """Fallback link discovery by paging the search UI in a browser"""
     driver = init_driver(headless=False)  # Disable headless for debugging
     
     try:
@@ -208,37 +407,103 @@ def main():
         load_all_movies(driver)
         
         print("Extracting main movie links...")
-        soup = BeautifulSoup(driver.page_source, "lxml")
-        movie_links = [
-            f"https://www.imdb.com{a['href'].split('?')[0]}"
-            for a in soup.select('a.ipc-title-link-wrapper[href*="/title/tt"]')
+        tree = lxml.html.fromstring(driver.page_source)
+        return [
+            f"https://www.imdb.com{a.get('href').split('?')[0]}"
+            for a in _SEL_MOVIE_LINKS(tree)
         ]
-        print(f"Total movies found: {len(movie_links)}")
-        
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            futures = {executor.submit(scrape_reviews, url): url 
-                      for url in movie_links}
-            
-            with open('reviews.csv', 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=[
-                    'title', 'year', 'genres', 'imdb_rating',
-                    'director', 'cast', 'user_rating', 'helpful', 'review_text'
-                ])
-                writer.writeheader()
-                
-                for i, future in enumerate(as_completed(futures), 1):
-                    url = futures[future]
-                    try:
-                        result = future.result()
-                        writer.writerows(result)
-                        print(f"Processed {i}: {len(result)} reviews ({url})")
-                        if len(result) == 0:
-                            print("Zero reviews - check selectors manually!")
-                    except Exception as e:
-                        print(f"Failed {i}: {str(e)[:80]} ({url})")
 
     finally:
         driver.quit()
 
+async def scrape_movie(session, semaphore, cache, url):
+    """(url, metadata, reviews, skipped, error); errors are returned with the URL, not raised"""
+    try:
+        # Scraped movies by tconst, so re-runs skip movies fetched in the last CACHE_EXPIRE
+        tconst = _TCONST_RE.search(url).group(0)
+        cached = cache.get(tconst)
+        if cached is not None:
+            return (url, *cached, None)
+        
+        async with semaphore:
+            scraped = await scrape_reviews(session, url)
+        if scraped is None:
+            return url, None, [], 0, None
+        
+        # Only complete scrapes are cached, so the next run retries the rest.
+        # A bot-challenge page still returns 2xx but yields no title.
+        metadata, reviews, skipped = scraped
+        if metadata['title'] != 'N/A' and reviews:
+            cache.set(tconst, scraped, expire=CACHE_EXPIRE, tag='reviews')
+        return (url, *scraped, None)
+    
+    except Exception as e:
+        return url, None, [], 0, e
+
+def write_gzip_member(file, rows):
+    """Append rows as a complete gzip member, so a partly written file still decompresses"""
+    buffer = io.StringIO(newline='')
+    csv.writer(buffer).writerows(rows)
+    # Level 1 is almost free and review prose still compresses several-fold
+    file.write(gzip.compress(buffer.getvalue().encode('utf-8'), compresslevel=1))
+    file.flush()
+
+async def scrape_all(session, cache, movie_links):
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_MOVIES)
+    tasks = [scrape_movie(session, semaphore, cache, url) for url in movie_links]
+    
+    # Rows are written from this coroutine only, so the files need no locking
+    with open(MOVIES_FILE, 'wb') as movies_file, open(REVIEWS_FILE, 'wb') as reviews_file:
+        write_gzip_member(movies_file, [MOVIE_FIELDS])
+        write_gzip_member(reviews_file, [REVIEW_FIELDS])
+        pending_movies = []
+        pending_reviews = []
+        
+        def write_pending():
+            if pending_movies:
+                write_gzip_member(movies_file, pending_movies)
+            if pending_reviews:
+                write_gzip_member(reviews_file, pending_reviews)
+            pending_movies.clear()
+            pending_reviews.clear()
+        
+        try:
+            for i, task in enumerate(asyncio.as_completed(tasks), 1):
+                url, metadata, result, skipped, error = await task
+                if error is not None:
+                    print(f"Failed {i}: {str(error)[:80]} ({url})")
+                    continue
+                
+                if metadata is not None:
+                    pending_movies.append(_movie_row(metadata))
+                pending_reviews.extend(map(_review_row, result))
+                if len(pending_movies) >= FLUSH_EVERY:
+                    write_pending()
+                print(f"Processed {i}: {len(result)} reviews ({url})")
+                if len(result) == 0:
+                    print("Zero reviews - check selectors manually!")
+                if skipped:
+                    print(f"Skipped {skipped} reviews (no body in the HTML or page data, or unparseable)")
+        
+        finally:
+            # Keep movies finished since the last batch even if the loop is interrupted
+            write_pending()
+
+async def main():
+    async with create_session() as session:
+        print("Searching movies...")
+        try:
+            movie_links = await fetch_movie_links(session)
+        except Exception as e:
+            print(f"Search API error: {str(e)[:60]}")
+            movie_links = []
+        
+        if not movie_links:
+            movie_links = await asyncio.to_thread(collect_movie_links)
+        
+        print(f"Total movies found: {len(movie_links)}")
+        with diskcache.Cache(CACHE_DIR, size_limit=CACHE_SIZE_LIMIT) as cache:
+            await scrape_all(session, cache, movie_links)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file